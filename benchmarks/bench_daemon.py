@@ -0,0 +1,72 @@
+"""
+Cold vs. warm CLI latency.
+
+Cold runs force in-process execution (BUTLER_NO_DAEMON=1); warm runs go
+through a running `butler daemon`. Everything happens in a throwaway HOME
+so your real task DB and memory bank are never touched.
+
+    python benchmarks/bench_daemon.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+COMMANDS = [
+    ["add", "benchmark task"],
+    ["list"],
+    ["recall"],
+    ["status"],
+]
+
+
+def _time_command(argv, env, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "butler.main"] + argv, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, PYTHONPATH=SRC)
+        subprocess.run([sys.executable, "-c", "from butler import tasks; tasks.init_db()"],
+                       env=env, check=True)
+        subprocess.run([sys.executable, "-m", "butler.main", "remember", "bench", "yes"],
+                       env=dict(env, BUTLER_NO_DAEMON="1"), check=True, stdout=subprocess.DEVNULL)
+
+        cold = {" ".join(c): _time_command(c, dict(env, BUTLER_NO_DAEMON="1"), args.runs)
+                for c in COMMANDS}
+
+        daemon = subprocess.Popen([sys.executable, "-m", "butler.main", "daemon"], env=env,
+                                  stdout=subprocess.DEVNULL)
+        try:
+            sock = Path(home) / ".butler.sock"
+            while not sock.exists():
+                time.sleep(0.05)
+            warm = {" ".join(c): _time_command(c, env, args.runs) for c in COMMANDS}
+        finally:
+            subprocess.run([sys.executable, "-m", "butler.main", "daemon", "stop"], env=env,
+                           stdout=subprocess.DEVNULL)
+            daemon.wait()
+
+    print(f"{'command':<22}{'cold (ms)':>12}{'warm (ms)':>12}{'speedup':>10}")
+    for name in cold:
+        print(f"{name:<22}{cold[name]:>12.1f}{warm[name]:>12.1f}{cold[name] / warm[name]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
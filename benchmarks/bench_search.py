@@ -0,0 +1,74 @@
+"""
+LIKE scan vs. FTS5 search over a synthetic task database.
+
+Builds a throwaway DB with --rows tasks (1M by default, takes a little
+while), then times the same word lookups both ways.
+
+    python benchmarks/bench_search.py [--rows 1000000] [--runs 5]
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from butler import tasks  # noqa: E402
+
+# A few verbs that show up everywhere, plus a long tail of rarer nouns,
+# roughly like a real backlog.
+VERBS = "call email fix write review buy book plan renew clean pay update send read".split()
+NOUNS = [f"{a}{b}" for a in ("pass", "inv", "rep", "gard", "tax", "serv", "back", "slid", "team",
+                             "doc", "car", "bill", "trip", "gift", "lamp", "code", "bank", "roof")
+         for b in ("port", "oice", "ort", "en", "es", "er", "up", "es", "mate", "tor", "go", "ing",
+                   "let", "ster", "ment", "ward", "ville", "ly", "ness", "ship", "hood", "dom")]
+QUERIES = ["renew", "passport", "invoice report", "roofward bankdom", "gifthood"]
+
+
+def _synthetic_tasks(rows, seed=42):
+    rng = random.Random(seed)
+    for i in range(rows):
+        words = [rng.choice(VERBS)] + [rng.choice(NOUNS) for _ in range(rng.randint(2, 6))]
+        yield " ".join(words) + f" #{i}"
+
+
+def _median_ms(func, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tasks.DB_FILE = Path(tmp) / "bench.db"
+        start = time.perf_counter()
+        tasks.import_tasks(_synthetic_tasks(args.rows))
+        print(f"Built {args.rows:,} rows in {time.perf_counter() - start:.1f}s\n")
+
+        conn = tasks._get_connection()
+        print(f"{'query':<18}{'LIKE (ms)':>12}{'FTS5 (ms)':>12}{'speedup':>10}")
+        for query in QUERIES:
+            # LIKE has no ranking, so it must find every match before we could sort
+            like_sql = ("SELECT id FROM todos WHERE "
+                        + " AND ".join("task LIKE ?" for _ in query.split()))
+            like_args = [f"%{word}%" for word in query.split()]
+            fts_args = (tasks._fts_query(query), 20)
+
+            like = _median_ms(lambda: conn.execute(like_sql, like_args).fetchall(), args.runs)
+            fts = _median_ms(lambda: conn.execute(tasks.SEARCH_TASKS, fts_args).fetchall(), args.runs)
+            print(f"{query:<18}{like:>12.1f}{fts:>12.1f}{like / fts:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
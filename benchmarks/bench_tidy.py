@@ -0,0 +1,78 @@
+"""
+Tidy throughput over a synthetic downloads folder.
+
+Creates --files empty files with a mix of extensions, then times the
+original one-file-at-a-time loop against the plan/execute engine, each
+on a fresh copy of the folder.
+
+    python benchmarks/bench_tidy.py [--files 200000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from butler import tidy  # noqa: E402
+
+SUFFIXES = [ext for exts in tidy.EXTENSIONS.values() for ext in exts] + [".bin", ".dat", ""]
+
+
+def _make_tree(path: Path, count: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    path.mkdir()
+    for i in range(count):
+        with open(path / f"file_{i}{rng.choice(SUFFIXES)}", "wb"):
+            pass
+
+
+def _legacy_organize(path: Path) -> None:
+    """The original loop: linear extension search, mkdir and shutil.move per file."""
+    files = [f for f in path.iterdir() if f.is_file() and not f.name.startswith('.')]
+    for file in files:
+        destination_folder = "Misc"
+        for category, exts in tidy.EXTENSIONS.items():
+            if file.suffix.lower() in exts:
+                destination_folder = category
+                break
+        target_dir = path / destination_folder
+        target_dir.mkdir(exist_ok=True)
+        shutil.move(str(file), str(target_dir / file.name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200_000)
+    args = parser.parse_args()
+
+    # Keep the engine's progress bar from dominating the measurement
+    tidy.console.quiet = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_dir, engine_dir = Path(tmp) / "legacy", Path(tmp) / "engine"
+        _make_tree(legacy_dir, args.files)
+        _make_tree(engine_dir, args.files)
+        os.sync()
+
+        start = time.perf_counter()
+        _legacy_organize(legacy_dir)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        moves = tidy.plan_directory(engine_dir)
+        planned = time.perf_counter() - start
+        tidy.execute_plan(engine_dir, moves)
+        engine = time.perf_counter() - start
+
+    print(f"{args.files:,} files")
+    print(f"  original loop : {legacy:8.2f}s")
+    print(f"  plan + execute: {engine:8.2f}s  (planning {planned:.2f}s)  {legacy / engine:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
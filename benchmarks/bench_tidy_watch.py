@@ -0,0 +1,89 @@
+"""
+Watch-mode lag: how long from a file landing to it being filed away.
+
+Starts `tidy.watch_directory` on a temp folder, creates --files files at
+--rate per second, and records when each one shows up in its category
+folder. Reports lag percentiles for each backend. Lag includes the
+--settle debounce, which is the floor on purpose.
+
+    python benchmarks/bench_tidy_watch.py [--files 500] [--rate 200] [--settle 0.25]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from butler import tidy  # noqa: E402
+
+
+def _run(backend, files, rate, settle, poll):
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        stop = threading.Event()
+        thread = threading.Thread(target=tidy.watch_directory, args=(str(folder),),
+                                  kwargs={"settle": settle, "poll": poll, "backend": backend, "stop": stop})
+        thread.start()
+        time.sleep(0.2)  # Let the watcher finish its initial sweep
+
+        created, lags = {}, {}
+        target = folder / "Documents"
+        done = threading.Event()
+
+        def check():
+            # Runs alongside the writer so lag is measured as files get placed
+            while not done.is_set():
+                if target.exists():
+                    now = time.monotonic()
+                    for name in os.listdir(target):
+                        if name not in lags and name in created:
+                            lags[name] = now - created[name]
+                if len(lags) == files:
+                    return
+                time.sleep(0.005)
+
+        checker = threading.Thread(target=check)
+        checker.start()
+
+        interval = 1 / rate
+        for i in range(files):
+            name = f"file_{i}.txt"
+            created[name] = time.monotonic()
+            with open(folder / name, "wb") as f:
+                f.write(b"x" * 1024)
+            time.sleep(interval)
+
+        checker.join(timeout=settle + 30)
+        done.set()
+        stop.set()
+        thread.join()
+
+    ms = sorted(lag * 1000 for lag in lags.values())
+    return len(ms), statistics.median(ms), ms[int(len(ms) * 0.95) - 1], ms[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=200, help="Files created per second")
+    parser.add_argument("--settle", type=float, default=0.25)
+    parser.add_argument("--poll", type=float, default=0.1)
+    args = parser.parse_args()
+
+    tidy.console.quiet = True
+    backends = ["poll"] + (["inotify"] if sys.platform.startswith("linux") else [])
+
+    print(f"{args.files} files at {args.rate:.0f}/s, settle {args.settle * 1000:.0f}ms")
+    print(f"{'backend':<10}{'placed':>8}{'p50 (ms)':>12}{'p95 (ms)':>12}{'max (ms)':>12}")
+    for backend in backends:
+        placed, p50, p95, worst = _run(backend, args.files, args.rate, args.settle, args.poll)
+        print(f"{backend:<10}{placed:>8}{p50:>12.0f}{p95:>12.0f}{worst:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
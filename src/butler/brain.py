@@ -1,37 +1,212 @@
+import bisect
+import contextlib
+import fnmatch
 import json
 import os
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
-# We store the memory in the user's home folder so it persists globally
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+# We store the memory in the user's home folder so it persists globally.
+# Writes append one record to the log; every so often the log is folded
+# into the snapshot ("compaction") so replaying it on load stays cheap.
+SNAPSHOT_FILE = Path.home() / ".butler_memory.snapshot"
+LOG_FILE = Path.home() / ".butler_memory.log"
+
+# Held while changing the store, so concurrent scripts don't lose updates
+LOCK_FILE = Path.home() / ".butler_memory.lock"
+
+# The old single-file format, migrated into the snapshot on first use
 MEMORY_FILE = Path.home() / ".butler_memory.json"
 
-def _load_memory() -> Dict[str, str]:
-    """Internal helper: Reads the JSON file."""
-    if not MEMORY_FILE.exists():
-        return {}
+# Compact once the log outgrows this, or the snapshot, whichever is bigger
+COMPACT_MIN_BYTES = 64 * 1024
+
+class _Cache:
+    """What we last read from disk, and how far into the log we got."""
+
+    def __init__(self):
+        self.data: Dict[str, str] = {}
+        self.snapshot: Optional[Tuple[int, int, int]] = None
+        self.log_inode: Optional[int] = None
+        self.log_offset = 0
+        self.sorted_keys: Optional[List[str]] = None
+
+_cache = _Cache()
+
+@contextlib.contextmanager
+def _locked():
+    """Holds an exclusive cross-process lock on the memory bank."""
+    if fcntl is None:
+        yield
+        return
+    with open(LOCK_FILE, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """Identifies a version of a file: a replace changes the inode, a write the mtime/size."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def _fsync_dir(path: Path) -> None:
+    """Makes a rename inside path durable (not supported on Windows)."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _write_snapshot(data: Dict[str, str]) -> None:
+    """Atomically replaces the snapshot: write a temp file, fsync, rename."""
+    tmp = SNAPSHOT_FILE.with_name(SNAPSHOT_FILE.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, SNAPSHOT_FILE)
+    _fsync_dir(SNAPSHOT_FILE.parent)
+
+def _migrate_legacy() -> None:
+    """One-time import of ~/.butler_memory.json into the new store."""
+    if SNAPSHOT_FILE.exists() or LOG_FILE.exists() or not MEMORY_FILE.exists():
+        return
     try:
         with open(MEMORY_FILE, 'r') as f:
-            return json.load(f)
+            data = json.load(f)
     except json.JSONDecodeError:
-        return {}
+        data = {}
+    _write_snapshot(data)
+
+def _apply(data: Dict[str, str], line: bytes) -> None:
+    """Applies one log record to data. Torn or garbled lines are skipped."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return  # A write cut short by a crash
+    if record[0] == "set":
+        data[record[1]] = record[2]
+    elif record[0] == "del":
+        data.pop(record[1], None)
+
+def _load_memory() -> Dict[str, str]:
+    """
+    Internal helper: Returns the memory as snapshot plus log.
+    Cached between calls; only log records we haven't seen yet are read.
+    Treat the result as read-only.
+    """
+    _migrate_legacy()
+    cache = _cache
+
+    snapshot = _signature(SNAPSHOT_FILE)
+    log = _signature(LOG_FILE)
+    log_inode, log_size = (log[0], log[2]) if log else (None, 0)
+
+    # Compaction (new snapshot, truncated log) means starting over
+    if snapshot != cache.snapshot or log_inode != cache.log_inode or log_size < cache.log_offset:
+        cache.data = {}
+        if snapshot:
+            with open(SNAPSHOT_FILE, 'r', encoding="utf-8") as f:
+                cache.data = json.load(f)
+        cache.snapshot = snapshot
+        cache.log_inode = log_inode
+        cache.log_offset = 0
+        cache.sorted_keys = None
+
+    if log_size > cache.log_offset:
+        with open(LOG_FILE, 'rb') as f:
+            f.seek(cache.log_offset)
+            chunk = f.read(log_size - cache.log_offset)
+        # Stop at the last newline: a writer may be halfway through a record
+        complete = chunk.rfind(b"\n") + 1
+        for line in chunk[:complete].splitlines():
+            _apply(cache.data, line)
+        cache.log_offset += complete
+        if complete:
+            cache.sorted_keys = None
+
+    return cache.data
+
+def _match(pattern: str) -> Dict[str, str]:
+    """
+    Finds keys matching a glob like "project.*".
+    The literal prefix before the first wildcard narrows the search with a
+    binary search over the sorted keys, so we only test the candidates.
+    """
+    data = _load_memory()
+    if _cache.sorted_keys is None:
+        _cache.sorted_keys = sorted(data)
+    keys = _cache.sorted_keys
+
+    cut = min((pattern.index(c) for c in "*?[" if c in pattern), default=len(pattern))
+    prefix = pattern[:cut]
 
-def _save_memory(data: Dict[str, str]) -> None:
-    """Internal helper: Writes to the JSON file."""
-    with open(MEMORY_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
+    matches = {}
+    for i in range(bisect.bisect_left(keys, prefix), len(keys)):
+        if not keys[i].startswith(prefix):
+            break
+        if fnmatch.fnmatchcase(keys[i], pattern):
+            matches[keys[i]] = data[keys[i]]
+    return matches
+
+def _append(record: list) -> int:
+    """
+    Internal helper: Durably appends one record to the log.
+    Returns the new log size.
+    """
+    _migrate_legacy()
+    line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    with open(LOG_FILE, "a+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            # If a crash tore the last record, start ours on a fresh line
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+        return size + len(line)
+
+def _maybe_compact(log_size: int) -> None:
+    """Folds the log into the snapshot once replaying it gets expensive."""
+    snapshot_size = SNAPSHOT_FILE.stat().st_size if SNAPSHOT_FILE.exists() else 0
+    if log_size < max(COMPACT_MIN_BYTES, snapshot_size):
+        return
+
+    _write_snapshot(_load_memory())
+    # The snapshot now holds everything, so the log can start over.
+    # A crash before this point only means replaying records twice.
+    with open(LOG_FILE, "wb") as f:
+        os.fsync(f.fileno())
 
 def remember(key: str, value: str) -> None:
     """Saves a new fact."""
-    data = _load_memory()
-    data[key] = value
-    _save_memory(data)
+    with _locked():
+        _maybe_compact(_append(["set", key, value]))
     print(f"🧠 I will remember: {key} = {value}")
 
 def recall(key: str = None) -> None:
     """
     Retrieves facts.
     If a key is provided, look up that specific item.
+    A key with wildcards (e.g. "project.*") lists every match.
     If no key is provided, list everything.
     """
     data = _load_memory()
@@ -41,7 +216,13 @@ def recall(key: str = None) -> None:
         return
 
     print("\n🧠 --- MEMORY BANK ---")
-    if key:
+    if key and any(c in key for c in "*?["):
+        matches = _match(key)
+        for k, v in matches.items():
+            print(f"🔹 {k}: {v}")
+        if not matches:
+            print(f"❌ Nothing matches '{key}'.")
+    elif key:
         # Look up specific item
         value = data.get(key)
         if value:
@@ -56,10 +237,12 @@ def recall(key: str = None) -> None:
 
 def forget(key: str) -> None:
     """Deletes a fact."""
-    data = _load_memory()
-    if key in data:
-        del data[key]
-        _save_memory(data)
+    with _locked():
+        known = key in _load_memory()
+        if known:
+            _maybe_compact(_append(["del", key]))
+
+    if known:
         print(f"🗑️ I have forgotten '{key}'.")
     else:
         print(f"❌ I never knew '{key}' to begin with.")
@@ -0,0 +1,198 @@
+import contextlib
+import io
+import json
+import os
+import re
+import shutil
+import socket
+import sys
+import traceback
+from pathlib import Path
+from typing import List, Optional
+
+# Lives next to ~/.butler_data.db and ~/.butler_memory.json
+SOCKET_FILE = Path.home() / ".butler.sock"
+
+# Modules worth keeping hot: these back the commands shell hooks call most.
+WARM_MODULES = ["butler.tasks", "butler.brain", "butler.system"]
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+# Protocol (one JSON object per line over the Unix socket):
+#   client -> daemon: {"argv": [...], "cwd": "...", "tty": true, "columns": 120}
+#                  or {"control": "stop" | "ping"}
+#   daemon -> client: {"stream": "out" | "err", "data": "..."} ... then {"exit": 0}
+
+
+def _send(conn: socket.socket, message: dict) -> None:
+    conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+class _ClientStream(io.TextIOBase):
+    """A file-like object that ships everything written to it back to the client."""
+
+    encoding = "utf-8"
+
+    def __init__(self, conn: Optional[socket.socket], stream: str, tty: bool):
+        self._conn = conn
+        self._stream = stream
+        self._tty = tty
+
+    def isatty(self) -> bool:
+        # Rich asks the file whether it is a terminal, so this decides
+        # whether spinners animate for the client.
+        return self._tty
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        if data and self._conn is not None:
+            _send(self._conn, {"stream": self._stream, "data": data})
+        return len(data)
+
+
+def _exit_code(exc: SystemExit) -> int:
+    if exc.code is None:
+        return 0
+    return exc.code if isinstance(exc.code, int) else 1
+
+
+def _run_request(conn: socket.socket, request: dict) -> int:
+    """Runs one forwarded CLI invocation in-process with output sent to the client."""
+    from butler import main
+
+    out = _ClientStream(conn, "out", request.get("tty", False))
+    err = _ClientStream(conn, "err", request.get("tty", False))
+
+    # Requests are served one at a time, so swapping process-wide state is safe.
+    os.chdir(request.get("cwd", str(Path.home())))
+    os.environ["COLUMNS"] = str(request.get("columns", 80))
+
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            main.run(request["argv"])
+            return 0
+        except SystemExit as e:
+            return _exit_code(e)
+        except Exception:
+            traceback.print_exc()
+            return 1
+
+
+def _warm_up() -> None:
+    """Imports the hot modules once, with a terminal-like stdout so Rich picks colours."""
+    import importlib
+
+    with contextlib.redirect_stdout(_ClientStream(None, "out", tty=True)):
+        for name in WARM_MODULES:
+            importlib.import_module(name)
+
+
+def serve(socket_path: Path = SOCKET_FILE) -> None:
+    """Runs the daemon in the foreground until stopped."""
+    if ping(socket_path):
+        print(f"⚠️  A butler daemon is already running on {socket_path}")
+        return
+
+    with contextlib.suppress(FileNotFoundError):
+        socket_path.unlink()  # Left behind by a daemon that died
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # The socket is for our user only
+    try:
+        server.bind(str(socket_path))
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+
+    _warm_up()
+    print(f"🛎️  Butler daemon listening on {socket_path} (pid {os.getpid()})")
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    request = json.loads(conn.makefile("rb").readline() or b"{}")
+                    if request.get("control") == "stop":
+                        _send(conn, {"exit": 0})
+                        break
+                    if request.get("control") == "ping":
+                        _send(conn, {"exit": 0})
+                        continue
+                    _send(conn, {"exit": _run_request(conn, request)})
+                except (OSError, ValueError):
+                    continue  # Client went away or sent garbage
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+        print("👋 Butler daemon stopped.")
+
+
+def _request(message: dict, socket_path: Path) -> Optional[int]:
+    """Sends a message to the daemon and relays its output. None if nobody is listening."""
+    if not socket_path.exists():
+        return None
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(str(socket_path))
+    except OSError:
+        conn.close()
+        return None
+
+    tty = sys.stdout.isatty()
+    with conn:
+        _send(conn, message)
+        for line in conn.makefile("rb"):
+            reply = json.loads(line)
+            if "exit" in reply:
+                return reply["exit"]
+            data = reply["data"] if tty else ANSI_ESCAPE.sub("", reply["data"])
+            target = sys.stdout if reply["stream"] == "out" else sys.stderr
+            target.write(data)
+            target.flush()
+    return 1  # Daemon hung up mid-command
+
+
+def forward(argv: List[str], socket_path: Path = SOCKET_FILE) -> Optional[int]:
+    """
+    Runs a CLI invocation inside the daemon.
+    Returns the exit code, or None if no daemon is running.
+    """
+    return _request({
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "tty": sys.stdout.isatty(),
+        "columns": shutil.get_terminal_size().columns,
+    }, socket_path)
+
+
+def ping(socket_path: Path = SOCKET_FILE) -> bool:
+    """True if a daemon answers on the socket."""
+    return _request({"control": "ping"}, socket_path) == 0
+
+
+def stop(socket_path: Path = SOCKET_FILE) -> None:
+    """Asks a running daemon to shut down."""
+    if _request({"control": "stop"}, socket_path) is None:
+        print("❌ No butler daemon is running.")
+    else:
+        print("✅ Butler daemon stopped.")
+
+
+def run(action: str = "start") -> None:
+    """Entry point for `butler daemon [start|stop|status]`."""
+    if action == "stop":
+        stop()
+    elif action == "status":
+        if ping():
+            print(f"✅ Butler daemon is running on {SOCKET_FILE}")
+        else:
+            print("💤 Butler daemon is not running.")
+    else:
+        serve()
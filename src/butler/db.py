@@ -0,0 +1,43 @@
+import sqlite3
+from pathlib import Path
+from typing import Sequence, Union
+
+# Tuned for a single-user CLI: WAL lets readers and the writer overlap,
+# NORMAL sync is durable across app crashes (only a power cut can lose
+# the last commit), and the bigger cache keeps hot pages off the disk.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -8000",   # Negative means KiB, so ~8 MB
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",  # Wait for another butler instead of failing
+)
+
+
+def connect(path: Union[str, Path]) -> sqlite3.Connection:
+    """
+    Opens a tuned connection.
+    The statement cache keeps our fixed SQL strings prepared between calls.
+    """
+    conn = sqlite3.connect(str(path), cached_statements=256, check_same_thread=False)
+    # This line makes the rows look like dictionaries instead of tuples
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def migrate(conn: sqlite3.Connection, migrations: Sequence[str]) -> None:
+    """
+    Brings the schema up to date.
+    migrations[i] upgrades the database from version i to i + 1; the current
+    version is kept in SQLite's built-in user_version field.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    for number, script in enumerate(migrations[version:], start=version + 1):
+        try:
+            conn.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {number};\nCOMMIT;")
+        except sqlite3.Error:
+            conn.rollback()
+            raise
@@ -120,6 +120,10 @@ class DigitalButlerApp(App):
         log_widget = self.query_one("#output_log", Static)
         log_widget.update(text)
 
-if __name__ == "__main__":
+def launch():
+    """Starts the Mission Control dashboard."""
     app = DigitalButlerApp()
     app.run()
+
+if __name__ == "__main__":
+    launch()
@@ -1,14 +1,83 @@
 import argparse
+import importlib
+import os
 import sys
-# Import ALL modules including payload, ai, and gui
-from butler import system, briefing, tasks, netsec, gitview, voice, gui, ai, payload
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Tuple
 
-def main():
-    parser = argparse.ArgumentParser(description="Digital Butler - CLI Tool")
-    subparsers = parser.add_subparsers(dest="command", required=True)
 
+class Command(NamedTuple):
+    """A lazily-loaded subcommand: the module is only imported when dispatched."""
+    module: str
+    entry: str
+    args: Callable[[argparse.Namespace], Tuple[Any, ...]] = lambda a: ()
+
+
+# The registry. Keep heavy imports (Textual, bs4, requests, psutil) out of
+# this file so `butler add` / `butler done` stay cheap in shell hooks.
+COMMANDS = {
     # --- 1. SYSTEM COMMANDS ---
-    subparsers.add_parser("tidy", help="Organize Desktop folder")
+    "tidy": Command("butler.tidy", "organize_directory",
+                    lambda a: (a.path, a.dry_run, a.workers, a.recursive, a.dedupe)),
+    "tidy:watch": Command("butler.tidy", "watch_directory", lambda a: (a.path, a.settle)),
+    "status": Command("butler.system", "report_status"),
+    "check": Command("butler.netsec", "check_safety", lambda a: (a.target,)),
+    "news": Command("butler.briefing", "get_top_stories", lambda a: (a.limit, a.read)),
+    "news:smart": Command("butler.briefing", "get_smart_briefing", lambda a: (a.limit, a.read)),
+
+    # --- 2. MEMORY COMMANDS ---
+    "remember": Command("butler.brain", "remember", lambda a: (a.key, a.value)),
+    "recall": Command("butler.brain", "recall", lambda a: (a.key,)),
+    "forget": Command("butler.brain", "forget", lambda a: (a.key,)),
+
+    # --- 3. TASK COMMANDS ---
+    "add": Command("butler.tasks", "add_task", lambda a: (a.task, a.priority)),
+    "add:file": Command("butler.tasks", "add_tasks_from_file", lambda a: (a.from_file,)),
+    "list": Command("butler.tasks", "list_tasks", lambda a: (a.all, a.limit, a.after)),
+    "search": Command("butler.tasks", "search_tasks", lambda a: (a.query, a.limit)),
+    "done": Command("butler.tasks", "complete_tasks", lambda a: (a.task_ids,)),
+    "export": Command("butler.tasks", "export_tasks", lambda a: (a.format,)),
+
+    # --- 4. NETWORK COMMANDS ---
+    "scan": Command("butler.netsec", "scan_target", lambda a: (a.target, a.timeout, a.concurrency)),
+
+    # --- 5. UTILITY COMMANDS ---
+    "speak": Command("butler.voice", "speak", lambda a: (a.text,)),
+    "gitview": Command("butler.gitview", "show_activity", lambda a: (".",)),
+    "mission": Command("butler.gui", "launch"),
+    "ask": Command("butler.ai", "ask_local_brain", lambda a: (a.prompt,)),
+    "daemon": Command("butler.daemon", "run", lambda a: (a.action,)),
+    "payload:rickroll": Command("butler.payload", "generate_rickroll"),
+    "payload:cmd": Command("butler.payload", "generate_terminal_command", lambda a: (a.text,)),
+    "payload:wifi": Command("butler.payload", "generate_wifi_grabber", lambda a: (a.ssid, a.password)),
+}
+
+COMMAND_NAMES = {key.split(":")[0] for key in COMMANDS}
+
+# Commands that must run in the caller's own process rather than the daemon.
+LOCAL_ONLY = {"mission", "daemon"}
+# ...and flags that mean the same: '-' reads our stdin, --watch runs forever.
+LOCAL_ONLY_FLAGS = {"-", "--watch"}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="butler", description="Digital Butler - CLI Tool")
+    parser.add_argument("--startup-profile", nargs="?", const="all", metavar="COMMAND",
+                        help="Show a per-module import-time breakdown and exit")
+    subparsers = parser.add_subparsers(dest="command")
+
+    # --- 1. SYSTEM COMMANDS ---
+    tidy_parser = subparsers.add_parser("tidy", help="Organize Desktop folder")
+    tidy_parser.add_argument("path", nargs="?", default=str(Path.home() / "Desktop"))
+    tidy_parser.add_argument("--dry-run", action="store_true", help="Show the plan, move nothing")
+    tidy_parser.add_argument("--workers", type=int, default=8,
+                             help="Threads for copies across devices and hashing")
+    tidy_parser.add_argument("--recursive", action="store_true", help="Include files in subfolders")
+    tidy_parser.add_argument("--dedupe", nargs="?", const="report", choices=["report", "link"],
+                             help="Find identical files; 'link' hard-links the copies")
+    tidy_parser.add_argument("--watch", action="store_true", help="Keep running and file new arrivals")
+    tidy_parser.add_argument("--settle", type=float, default=2.0,
+                             help="Seconds a new file must stay unchanged before it is moved")
     subparsers.add_parser("status", help="Show system status")
 
     # Check (Fixed: No --url flag required anymore)
@@ -22,23 +91,42 @@ def main():
     news_parser.add_argument("--smart", action="store_true")
 
     # --- 2. MEMORY COMMANDS ---
-    subparsers.add_parser("remember", help="Save clipboard")
-    subparsers.add_parser("recall", help="Show memory")
-    subparsers.add_parser("forget", help="Clear memory")
+    remember_parser = subparsers.add_parser("remember", help="Save a fact")
+    remember_parser.add_argument("key")
+    remember_parser.add_argument("value")
+    recall_parser = subparsers.add_parser("recall", help="Show memory")
+    recall_parser.add_argument("key", nargs="?")
+    forget_parser = subparsers.add_parser("forget", help="Forget a fact")
+    forget_parser.add_argument("key")
 
     # --- 3. TASK COMMANDS ---
     add_parser = subparsers.add_parser("add", help="Add task")
-    add_parser.add_argument("task", help="Task text")
+    add_parser.add_argument("task", nargs="?", help="Task text")
+    add_parser.add_argument("-p", "--priority", type=int, default=0)
+    add_parser.add_argument("--from-file", metavar="PATH",
+                            help="Import one task per line ('-' reads stdin)")
 
     list_parser = subparsers.add_parser("list", help="List tasks")
     list_parser.add_argument("--all", action="store_true")
+    list_parser.add_argument("--limit", type=int, help="Show at most this many tasks")
+    list_parser.add_argument("--after", type=int, default=0, metavar="ID",
+                             help="Start after this task ID (for paging)")
+
+    search_parser = subparsers.add_parser("search", help="Search tasks")
+    search_parser.add_argument("query", help="Words to look for")
+    search_parser.add_argument("--limit", type=int, default=20)
 
     done_parser = subparsers.add_parser("done", help="Complete task")
-    done_parser.add_argument("task_id", type=int)
+    done_parser.add_argument("task_ids", nargs="+", metavar="ID", help="IDs or ranges like 12-40")
+
+    export_parser = subparsers.add_parser("export", help="Export tasks")
+    export_parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
 
     # --- 4. NETWORK COMMANDS ---
     scan_parser = subparsers.add_parser("scan", help="Scan an IP")
     scan_parser.add_argument("target", help="Target IP")
+    scan_parser.add_argument("--timeout", type=float, default=1.0, help="Seconds to wait per probe")
+    scan_parser.add_argument("--concurrency", type=int, default=256, help="Hosts probed at once")
 
     # --- 5. UTILITY COMMANDS ---
     speak_parser = subparsers.add_parser("speak", help="TTS")
@@ -53,9 +141,14 @@ def main():
     ai_parser = subparsers.add_parser("ask", help="Ask AI")
     ai_parser.add_argument("prompt", type=str)
 
+    # Background daemon that keeps modules warm between invocations
+    daemon_parser = subparsers.add_parser("daemon", help="Run the background daemon")
+    daemon_parser.add_argument("action", nargs="?", default="start",
+                               choices=["start", "stop", "status"])
+
     # Flipper Zero Payloads
     payload_parser = subparsers.add_parser("payload", help="Generate Flipper Scripts")
-    payload_sub = payload_parser.add_subparsers(dest="payload_type")
+    payload_sub = payload_parser.add_subparsers(dest="payload_type", required=True)
 
     payload_sub.add_parser("rickroll", help="Generate prank script")
 
@@ -66,35 +159,120 @@ def main():
     wifi_parser.add_argument("ssid", help="Network Name")
     wifi_parser.add_argument("password", help="Password")
 
-    args = parser.parse_args()
-
-    # --- ROUTING ---
-    if args.command == "tidy": system.organize_desktop()
-    elif args.command == "status": system.report_status()
-    elif args.command == "check": netsec.check_safety(args.target)
-    elif args.command == "news":
-        if args.smart: briefing.get_smart_briefing(args.limit, args.read)
-        else: briefing.get_top_stories(args.limit, args.read)
-    elif args.command == "remember": tasks.remember_clipboard()
-    elif args.command == "recall": tasks.recall_memory()
-    elif args.command == "forget": tasks.forget_memory()
-    elif args.command == "add": tasks.add_task(args.task)
-    elif args.command == "list": tasks.list_tasks(args.all)
-    elif args.command == "done": tasks.complete_task(args.task_id)
-    elif args.command == "scan": netsec.scan_target(args.target)
-    elif args.command == "speak": voice.speak(args.text)
-    elif args.command == "gitview": gitview.show_activity(".")
-    elif args.command == "mission":
-        # Launch GUI
-        app = gui.DigitalButlerApp()
-        app.run()
-
-    # Advanced Modules
-    elif args.command == "ask": ai.ask_local_brain(args.prompt)
-    elif args.command == "payload":
-        if args.payload_type == "rickroll": payload.generate_rickroll()
-        elif args.payload_type == "cmd": payload.generate_terminal_command(args.text)
-        elif args.payload_type == "wifi": payload.generate_wifi_grabber(args.ssid, args.password)
+    return parser
+
+
+def _command_key(args: argparse.Namespace) -> str:
+    """Maps parsed arguments to a key in COMMANDS."""
+    if args.command == "news" and args.smart:
+        return "news:smart"
+    if args.command == "tidy" and args.watch:
+        return "tidy:watch"
+    if args.command == "add" and args.from_file:
+        return "add:file"
+    if args.command == "payload":
+        return f"payload:{args.payload_type}"
+    return args.command
+
+
+def dispatch(args: argparse.Namespace) -> None:
+    """Imports the command's module on demand and calls its entry function."""
+    command = COMMANDS[_command_key(args)]
+    module = importlib.import_module(command.module)
+    getattr(module, command.entry)(*command.args(args))
+
+
+def _parse_importtime(stderr: str):
+    """Parses `python -X importtime` output into (depth, name, self_us, cumulative_us)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((
+                (len(name) - len(name.lstrip())) // 2,
+                name.strip(),
+                int(self_us),
+                int(cumulative_us),
+            ))
+        except ValueError:
+            continue  # The header line
+    return rows
+
+
+def startup_profile(command: str = "all") -> None:
+    """
+    Measures what each command's module costs to import in a fresh interpreter.
+    Pass a command name to profile only that command.
+    """
+    import subprocess
+    from rich.console import Console
+    from rich.table import Table
+
+    modules = sorted({c.module for key, c in COMMANDS.items()
+                      if command == "all" or key.split(":")[0] == command})
+
+    table = Table(title="Startup Import Profile")
+    table.add_column("Module", style="cyan")
+    table.add_column("Import (ms)", justify="right", style="magenta")
+    table.add_column("Heaviest dependencies", style="green")
+
+    for module in ["butler.main"] + modules:
+        code = "import butler.main" + ("" if module == "butler.main" else f"; import {module}")
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              capture_output=True, text=True)
+        rows = _parse_importtime(proc.stderr)
+        # -X importtime prints children before their parent, so the parent of a
+        # depth-1 entry is the next depth-0 entry that follows it.
+        total = 0
+        children, pending = [], []
+        for depth, name, _, cumulative in rows:
+            if depth == 1:
+                pending.append((cumulative, name))
+            elif depth == 0:
+                if name == module:
+                    total = cumulative
+                    children = pending
+                pending = []
+        heaviest = ", ".join(f"{name} {us / 1000:.0f}ms"
+                             for us, name in sorted(children, reverse=True)[:3])
+        table.add_row(module, f"{total / 1000:.1f}", heaviest or "-")
+
+    Console().print(table)
+
+
+def run(argv=None) -> None:
+    """Parses and executes a command in this process."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.startup_profile:
+        startup_profile(args.startup_profile)
+        return
+
+    if args.command is None:
+        parser.error("a command is required")
+    if args.command == "add" and not (args.task or args.from_file):
+        parser.error("add needs task text or --from-file")
+
+    dispatch(args)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    # Hand the command to a warm daemon if one is running.
+    # Set BUTLER_NO_DAEMON=1 to force in-process execution.
+    if argv and argv[0] in COMMAND_NAMES and argv[0] not in LOCAL_ONLY \
+            and not LOCAL_ONLY_FLAGS.intersection(argv) and not os.environ.get("BUTLER_NO_DAEMON"):
+        from butler import daemon
+        code = daemon.forward(argv)
+        if code is not None:
+            sys.exit(code)
+
+    run(argv)
+
 
 if __name__ == "__main__":
     main()
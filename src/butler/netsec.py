@@ -1,12 +1,17 @@
+import asyncio
 import socket
 import ipaddress
+import struct
 import subprocess
 import platform
-import concurrent.futures
+from typing import AsyncIterator, Iterable, List, Optional, Sequence
 from rich.console import Console
 
 console = Console()
 
+# Ports that almost every kind of device answers on (even a refusal counts)
+DISCOVERY_PORTS = (80, 443, 22, 445, 139, 53, 3389, 8080)
+
 def check_safety(target: str):
     """
     Checks if a URL/IP resolves correctly (basic DNS check).
@@ -25,15 +30,19 @@ def is_host_up(ip: str) -> bool:
     Pings a host to see if it is alive.
     Works on Mac/Linux/Windows.
     """
-    param = '-n' if platform.system().lower() == 'windows' else '-c'
-    # Timeout logic: Windows uses -w (ms), Mac/Linux uses -W (sec)
-    # We set a short timeout (500ms) to speed up dead hosts
-    timeout_arg = ['-W', '500'] if platform.system().lower() == 'windows' else ['-W', '1']
+    system = platform.system().lower()
+    param = '-n' if system == 'windows' else '-c'
+    # Timeout logic: Windows uses -w (ms), macOS -W (ms), Linux -W (sec)
+    # We set a short timeout to speed up dead hosts
+    if system == 'windows':
+        timeout_arg = ['-w', '500']
+    elif system == 'darwin':
+        timeout_arg = ['-W', '1000']
+    else:
+        timeout_arg = ['-W', '1']
 
-    command = ['ping', param, '1', ip]
+    command = ['ping', param, '1'] + timeout_arg + [ip]
 
-    # Mac/Linux ping doesn't support milliseconds easily in all versions,
-    # so we rely on the standard 1s timeout or just standard return codes.
     try:
         # Run ping, suppress output
         subprocess.check_call(
@@ -42,12 +51,132 @@ def is_host_up(ip: str) -> bool:
             stderr=subprocess.DEVNULL
         )
         return True
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+async def _tcp_probe(ip: str, port: int, timeout: float, refused_is_up: bool) -> bool:
+    """Non-blocking connect. An accept or (optionally) a refusal both prove the host is there."""
+    loop = asyncio.get_running_loop()
+    family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+        return True
+    except ConnectionRefusedError:
+        return refused_is_up
+    except (asyncio.TimeoutError, OSError):
+        return False
+    finally:
+        sock.close()
+
+def _icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def icmp_available() -> bool:
+    """True if the kernel lets us ping without root (Linux ping_group_range, macOS)."""
+    try:
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP).close()
+        return True
+    except OSError:
+        return False
+
+async def _icmp_probe(ip: str, timeout: float) -> bool:
+    """One echo request over an unprivileged ICMP datagram socket."""
+    loop = asyncio.get_running_loop()
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    except OSError:
+        return False
+    sock.setblocking(False)
+    try:
+        # Type 8 (echo request); the kernel fills in our identifier
+        header = struct.pack("!BBHHH", 8, 0, 0, 0, 1)
+        payload = b"butler"
+        checksum = _icmp_checksum(header + payload)
+        sock.sendto(struct.pack("!BBHHH", 8, 0, checksum, 0, 1) + payload, (ip, 0))
+        reply = await asyncio.wait_for(loop.sock_recv(sock, 1024), timeout)
+        return bool(reply) and reply[0] == 0  # Type 0: echo reply
+    except (asyncio.TimeoutError, OSError):
         return False
+    finally:
+        sock.close()
+
+async def probe_host(ip: str, ports: Sequence[int] = DISCOVERY_PORTS, timeout: float = 1.0,
+                     icmp: bool = False, refused_is_up: bool = True) -> bool:
+    """Races all probes for one host and stops at the first answer."""
+    probes = [asyncio.ensure_future(_tcp_probe(ip, port, timeout, refused_is_up)) for port in ports]
+    if icmp:
+        probes.append(asyncio.ensure_future(_icmp_probe(ip, timeout)))
 
-def scan_target(target: str):
+    try:
+        for finished in asyncio.as_completed(probes):
+            if await finished:
+                return True
+        return False
+    finally:
+        for probe in probes:
+            probe.cancel()
+
+async def discover_hosts(hosts: Iterable[str], ports: Sequence[int] = DISCOVERY_PORTS,
+                         timeout: float = 1.0, concurrency: int = 256, icmp: bool = False,
+                         refused_is_up: bool = True) -> AsyncIterator[str]:
     """
-    Scans a CIDR range using threaded Pings (Sonar).
+    Yields live hosts as soon as each one answers.
+    At most `concurrency` hosts are probed at once, each with up to
+    len(ports) (+1 for ICMP) sockets open.
+    """
+    pending = iter(hosts)
+    found: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def worker():
+        for ip in pending:  # Shared iterator: each host goes to exactly one worker
+            if await probe_host(ip, ports, timeout, icmp, refused_is_up):
+                await found.put(ip)
+        await found.put(done)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        remaining = len(workers)
+        while remaining:
+            ip = await found.get()
+            if ip is done:
+                remaining -= 1
+            else:
+                yield ip
+    finally:
+        for w in workers:
+            w.cancel()
+
+def sweep(target: str, ports: Sequence[int] = DISCOVERY_PORTS, timeout: float = 1.0,
+          concurrency: int = 256, icmp: Optional[bool] = None) -> List[str]:
+    """
+    Finds live hosts in a CIDR range, printing each one as it answers.
+    ICMP is used when the kernel allows it unless icmp=False.
+    """
+    network = ipaddress.ip_network(target, strict=False)
+    hosts = (str(ip) for ip in network.hosts())
+    use_icmp = icmp_available() if icmp is None else icmp
+
+    async def run():
+        active = []
+        async for ip in discover_hosts(hosts, ports, timeout, concurrency, use_icmp):
+            console.print(f"[green]  [+] Device Online: {ip}[/green]")
+            active.append(ip)
+        return active
+
+    return asyncio.run(run())
+
+def scan_target(target: str, timeout: float = 1.0, concurrency: int = 256):
+    """
+    Scans a CIDR range with parallel connect probes (Sonar),
+    or the common ports of a single host.
     """
     try:
         if "/" in target:
@@ -56,23 +185,9 @@ def scan_target(target: str):
             total_hosts = len(hosts)
 
             console.print(f"[bold blue]🔭 Sonar Sweep: {target} ({total_hosts} targets)...[/bold blue]")
-            console.print("[dim]Please wait, launching parallel threads...[/dim]")
-
-            active_hosts = []
-
-            # We use a ThreadPool to ping 50 IPs at once
-            with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-                # Create a dictionary of {future: ip}
-                future_to_ip = {executor.submit(is_host_up, str(ip)): str(ip) for ip in hosts}
-
-                for future in concurrent.futures.as_completed(future_to_ip):
-                    ip = future_to_ip[future]
-                    try:
-                        if future.result():
-                            console.print(f"[green]  [+] Device Online: {ip}[/green]")
-                            active_hosts.append(ip)
-                    except Exception:
-                        pass
+            console.print("[dim]Please wait, probing hosts in parallel...[/dim]")
+
+            active_hosts = sweep(target, timeout=timeout, concurrency=concurrency)
 
             console.print(f"[bold green]✅ Scan Complete. Found {len(active_hosts)} active devices.[/bold green]")
 
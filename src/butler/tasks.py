@@ -1,69 +1,106 @@
+import contextlib
+import csv
+import json
+import os
 import sqlite3
+import sys
 from pathlib import Path
+from typing import Iterable, List
 from rich.console import Console
 from rich.table import Table
+from butler import db
 
 console = Console()
 DB_FILE = Path.home() / ".butler_data.db"
 
-def _get_connection():
-    """Connects to the database (creates it if missing)."""
-    conn = sqlite3.connect(DB_FILE)
-    # This line makes the rows look like dictionaries instead of tuples
-    conn.row_factory = sqlite3.Row
-    return conn
+# Schema history. Never edit an entry that has shipped; append a new one.
+MIGRATIONS = [
+    # 1. The original table (existing databases already have it)
+    '''
+    CREATE TABLE IF NOT EXISTS todos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task TEXT NOT NULL,
+        status TEXT DEFAULT 'pending'
+    );
+    ''',
+    # 2. Timestamps, priority and an index for `list` (which filters on status)
+    '''
+    ALTER TABLE todos ADD COLUMN created_at TEXT;
+    ALTER TABLE todos ADD COLUMN completed_at TEXT;
+    ALTER TABLE todos ADD COLUMN priority INTEGER NOT NULL DEFAULT 0;
+    CREATE INDEX IF NOT EXISTS idx_todos_status_id ON todos (status, id);
+    ''',
+    # 3. Full-text index over task text, kept in sync by triggers
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(task, content='todos', content_rowid='id');
+    CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO todos_fts (rowid, task) VALUES (new.id, new.task);
+    END;
+    CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos BEGIN
+        INSERT INTO todos_fts (todos_fts, rowid, task) VALUES ('delete', old.id, old.task);
+    END;
+    CREATE TRIGGER IF NOT EXISTS todos_fts_update AFTER UPDATE OF task ON todos BEGIN
+        INSERT INTO todos_fts (todos_fts, rowid, task) VALUES ('delete', old.id, old.task);
+        INSERT INTO todos_fts (rowid, task) VALUES (new.id, new.task);
+    END;
+    INSERT INTO todos_fts (todos_fts) VALUES ('rebuild');
+    ''',
+]
+
+# Fixed SQL strings, so the connection's statement cache keeps them prepared
+INSERT_TASK = "INSERT INTO todos (task, priority, created_at) VALUES (?, ?, datetime('now'))"
+# Keyset pagination: "id > ?" rides the (status, id) index, unlike OFFSET.
+# LIMIT -1 means no limit in SQLite.
+SELECT_ALL = "SELECT id, task, status FROM todos WHERE id > ? ORDER BY id LIMIT ?"
+SELECT_BY_STATUS = "SELECT id, task, status FROM todos WHERE status = ? AND id > ? ORDER BY id LIMIT ?"
+SEARCH_TASKS = ("SELECT t.id, t.task, t.status FROM todos_fts "
+                "JOIN todos AS t ON t.id = todos_fts.rowid "
+                "WHERE todos_fts MATCH ? ORDER BY rank LIMIT ?")
+COMPLETE_TASK = "UPDATE todos SET status = 'done', completed_at = COALESCE(completed_at, datetime('now')) WHERE id = ?"
+COMPLETE_RANGE = ("UPDATE todos SET status = 'done', completed_at = COALESCE(completed_at, datetime('now')) "
+                  "WHERE id BETWEEN ? AND ?")
+SELECT_EXPORT = "SELECT id, task, status, priority, created_at, completed_at FROM todos ORDER BY id"
+EXPORT_COLUMNS = ["id", "task", "status", "priority", "created_at", "completed_at"]
+
+_conn = None
+_conn_path = None
+
+def _get_connection() -> sqlite3.Connection:
+    """Returns the process-wide connection, opening and migrating it on first use."""
+    global _conn, _conn_path
+
+    # Re-open if DB_FILE was pointed somewhere else (tests do this)
+    if _conn is None or _conn_path != DB_FILE:
+        if _conn is not None:
+            _conn.close()
+        _conn = db.connect(DB_FILE)
+        db.migrate(_conn, MIGRATIONS)
+        _conn_path = DB_FILE
+    return _conn
 
 def init_db():
     """Creates the table structure if it doesn't exist."""
-    conn = _get_connection()
-    cursor = conn.cursor()
-
-    # SQL: Create a table with an ID, a Description, and a Status
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS todos (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            task TEXT NOT NULL,
-            status TEXT DEFAULT 'pending'
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    _get_connection()
 
-def add_task(description: str):
+def add_task(description: str, priority: int = 0):
     """Adds a new row to the table."""
     conn = _get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("INSERT INTO todos (task) VALUES (?)", (description,))
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(INSERT_TASK, (description, priority))
 
     console.print(f"[bold green]✅ Added task:[/bold green] {description}")
 
-def list_tasks(show_all=False):
-    """Reads rows and displays them in a Rich Table."""
-    conn = _get_connection()
-    cursor = conn.cursor()
-
-    if show_all:
-        query = "SELECT * FROM todos"
-    else:
-        query = "SELECT * FROM todos WHERE status = 'pending'"
-
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    conn.close()
-
-    if not rows:
-        console.print("[yellow]Nothing to do! Relax. 🏖️[/yellow]")
-        return
-
-    # Build the UI Table
-    table = Table(title="Task List")
+def _task_table(rows, title: str):
+    """
+    Builds the UI table straight from a cursor (no fetchall() in between).
+    Returns the table and the last ID it saw, for paging.
+    """
+    table = Table(title=title)
     table.add_column("ID", style="cyan", justify="right")
     table.add_column("Task", style="white")
     table.add_column("Status", justify="center")
 
+    last_id = None
     for row in rows:
         status_style = "green" if row['status'] == 'done' else "red"
         status_icon = "✅" if row['status'] == 'done' else "⏳"
@@ -73,23 +110,140 @@ def list_tasks(show_all=False):
             row['task'],
             f"[{status_style}]{status_icon} {row['status']}"
         )
+        last_id = row['id']
+    return table, last_id
+
+def list_tasks(show_all=False, limit: int = None, after: int = 0):
+    """
+    Reads rows and displays them in a Rich Table.
+    Use limit/after to page through big lists: pass the last ID you saw as after.
+    """
+    conn = _get_connection()
+    page_size = -1 if limit is None else limit
+
+    if show_all:
+        rows = conn.execute(SELECT_ALL, (after, page_size))
+    else:
+        rows = conn.execute(SELECT_BY_STATUS, ("pending", after, page_size))
+
+    table, last_id = _task_table(rows, "Task List")
+
+    if not table.row_count:
+        console.print("[yellow]Nothing to do! Relax. 🏖️[/yellow]")
+        return
+
+    if table.row_count == limit:
+        table.caption = f"More tasks: butler list --limit {limit} --after {last_id}"
+
+    console.print(table)
+
+def _fts_query(text: str) -> str:
+    """Quotes each word so user input can't trip FTS syntax; the last word matches as a prefix."""
+    words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+def search_tasks(query: str, limit: int = 20):
+    """Full-text search over task text, best matches first."""
+    match = _fts_query(query)
+    if not match:
+        console.print("[red]❌ Give me something to search for.[/red]")
+        return
+
+    rows = _get_connection().execute(SEARCH_TASKS, (match, limit))
+    table, _ = _task_table(rows, f"Search: {query}")
+
+    if not table.row_count:
+        console.print(f"[yellow]No tasks match '{query}'.[/yellow]")
+        return
 
     console.print(table)
 
 def complete_task(task_id: int):
     """Updates a row to set status to 'done'."""
     conn = _get_connection()
-    cursor = conn.cursor()
+    with conn:
+        updated = conn.execute(COMPLETE_TASK, (task_id,)).rowcount
 
-    # Check if it exists first
-    cursor.execute("SELECT * FROM todos WHERE id = ?", (task_id,))
-    if not cursor.fetchone():
+    if not updated:
         console.print(f"[red]❌ Task ID {task_id} not found.[/red]")
         return
 
-    # The Update
-    cursor.execute("UPDATE todos SET status = 'done' WHERE id = ?", (task_id,))
-    conn.commit()
-    conn.close()
-
     console.print(f"[bold green]✨ Task {task_id} marked as complete![/bold green]")
+
+def import_tasks(lines: Iterable[str]) -> int:
+    """
+    Adds one task per non-blank line in a single transaction.
+    The lines are consumed lazily, so huge inputs never sit in memory.
+    """
+    rows = ((line.strip(), 0) for line in lines if line.strip())
+
+    conn = _get_connection()
+    with conn:
+        return conn.executemany(INSERT_TASK, rows).rowcount
+
+def add_tasks_from_file(path: str):
+    """Bulk-imports tasks from a text file, or from stdin when path is '-'."""
+    try:
+        if path == "-":
+            count = import_tasks(sys.stdin)
+        else:
+            with open(path, encoding="utf-8") as f:
+                count = import_tasks(f)
+    except OSError as e:
+        console.print(f"[red]❌ Could not read {path}: {e}[/red]")
+        return
+
+    console.print(f"[bold green]✅ Imported {count} tasks.[/bold green]")
+
+def _parse_id_specs(specs: List[str]):
+    """Splits specs like ['3', '7', '12-40'] into single ids and (low, high) ranges."""
+    ids, ranges = [], []
+    for spec in specs:
+        low, sep, high = spec.partition("-")
+        if sep:
+            ranges.append((int(low), int(high)))
+        else:
+            ids.append((int(low),))
+    return ids, ranges
+
+def complete_tasks(specs: List[str]):
+    """Marks many tasks done in one transaction, e.g. ['3', '7', '12-40']."""
+    try:
+        ids, ranges = _parse_id_specs(specs)
+    except ValueError:
+        console.print(f"[red]❌ Task IDs must look like 3 or 12-40, got: {' '.join(specs)}[/red]")
+        return
+
+    # A lone ID keeps the classic "not found" feedback
+    if len(ids) == 1 and not ranges:
+        complete_task(ids[0][0])
+        return
+
+    conn = _get_connection()
+    with conn:
+        updated = conn.executemany(COMPLETE_TASK, ids).rowcount
+        updated += conn.executemany(COMPLETE_RANGE, ranges).rowcount
+
+    console.print(f"[bold green]✨ Marked {updated} tasks as complete![/bold green]")
+
+def export_tasks(fmt: str = "jsonl"):
+    """Streams every task to stdout as JSON Lines or CSV."""
+    rows = _get_connection().execute(SELECT_EXPORT)
+    out = sys.stdout
+
+    try:
+        if fmt == "csv":
+            writer = csv.writer(out)
+            writer.writerow(EXPORT_COLUMNS)
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                out.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n")
+        out.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); point stdout at devnull so
+        # the interpreter doesn't complain again while flushing at exit.
+        with contextlib.suppress(OSError, ValueError):
+            os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
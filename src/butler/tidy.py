@@ -1,15 +1,273 @@
+import concurrent.futures
+import errno
+import hashlib
 import os
 import shutil
+import threading
+import time
+from collections import defaultdict
 from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set
 from rich.console import Console
 from rich.progress import track
+from rich.table import Table
+from butler import watcher
 
 console = Console()
 
-def organize_directory(path_str: str) -> None:
+# Define our rules
+EXTENSIONS = {
+    "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".heic"],
+    "Documents": [".pdf", ".docx", ".txt", ".xlsx", ".pptx", ".md", ".csv"],
+    "Audio": [".mp3", ".wav", ".aac", ".flac"],
+    "Video": [".mp4", ".mov", ".avi", ".mkv"],
+    "Archives": [".zip", ".tar", ".gz", ".rar"],
+    "Code": [".py", ".js", ".html", ".css", ".json", ".cpp"]
+}
+
+# The same rules flipped around, so each file is one dict lookup
+CATEGORY_BY_SUFFIX = {ext: category for category, exts in EXTENSIONS.items() for ext in exts}
+
+# Folders we sort into; a recursive run leaves them alone
+CATEGORY_FOLDERS = set(EXTENSIONS) | {"Misc"}
+
+# Dedupe reads this much from each end of a file before committing to a full hash
+PARTIAL_BLOCK = 64 * 1024
+READ_BUFFER = 1024 * 1024
+
+# Browsers' in-progress downloads; watch mode waits for the real name
+PARTIAL_SUFFIXES = {".part", ".crdownload", ".download", ".partial", ".tmp"}
+
+class Move(NamedTuple):
+    """One planned file move."""
+    source: str
+    target: str
+    category: str
+
+def _scan(path: Path, recursive: bool) -> Iterator[os.DirEntry]:
+    """
+    Yields the files to organise.
+    os.scandir hands back the file type with each entry, so we don't
+    need a stat() call per file just to skip directories.
+    """
+    pending = [str(path)]
+    while pending:
+        folder = pending.pop()
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                # We filter out hidden files like .DS_Store (and hidden folders)
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_file():
+                    yield entry
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    if folder == str(path) and entry.name in CATEGORY_FOLDERS:
+                        continue  # Already sorted
+                    pending.append(entry.path)
+
+def _existing_names(folder: Path) -> Set[str]:
+    """Names already in a target folder (casefolded, for case-insensitive disks)."""
+    try:
+        with os.scandir(folder) as entries:
+            return {entry.name.casefold() for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+def _unique_name(name: str, taken: Set[str]) -> str:
+    """Returns name, or 'name (1).ext', 'name (2).ext', ... if it is taken."""
+    if name.casefold() not in taken:
+        return name
+    stem, ext = os.path.splitext(name)
+    n = 1
+    while f"{stem} ({n}){ext}".casefold() in taken:
+        n += 1
+    return f"{stem} ({n}){ext}"
+
+def plan_directory(path: Path, recursive: bool = False) -> List[Move]:
+    """
+    Phase 1: decide where every file goes, without touching anything.
+    Files are planned in sorted order so name clashes always resolve the same way.
+    """
+    return plan_files(path, sorted(entry.path for entry in _scan(path, recursive)))
+
+def plan_files(path: Path, sources: List[str]) -> List[Move]:
+    """Plans moves for specific files into the category folders under path."""
+    taken: Dict[str, Set[str]] = {}
+    moves = []
+    for source in sources:
+        name = os.path.basename(source)
+        suffix = os.path.splitext(name)[1].lower()
+        category = CATEGORY_BY_SUFFIX.get(suffix, "Misc")
+
+        if category not in taken:
+            taken[category] = _existing_names(path / category)
+        target_name = _unique_name(name, taken[category])
+        taken[category].add(target_name.casefold())
+
+        moves.append(Move(source, os.path.join(path, category, target_name), category))
+    return moves
+
+def _partial_hash(path: str, size: int) -> Optional[bytes]:
+    """Hashes the first and last blocks. For small files that is the whole file."""
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            h.update(f.read(PARTIAL_BLOCK))
+            if size > PARTIAL_BLOCK:
+                f.seek(max(PARTIAL_BLOCK, size - PARTIAL_BLOCK))
+                h.update(f.read(PARTIAL_BLOCK))
+    except OSError:
+        return None
+    return h.digest()
+
+def _full_hash(path: str) -> Optional[bytes]:
+    """Streams the whole file through the hash, one reused buffer at a time."""
+    h = hashlib.blake2b()
+    buffer = bytearray(READ_BUFFER)
+    view = memoryview(buffer)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                h.update(view[:n])
+    except OSError:
+        return None
+    return h.digest()
+
+def find_duplicates(paths: List[str], workers: int = 8) -> List[List[str]]:
+    """
+    Groups files with identical content, cheapest test first:
+    1. same size (a stat), 2. same first/last blocks, 3. same full hash.
+    Most files drop out before step 3, so they are never read in full.
+    Each group is sorted; empty files are ignored.
+    """
+    by_size: Dict[int, List[str]] = defaultdict(list)
+    for path in paths:
+        size = os.stat(path).st_size
+        if size:
+            by_size[size].append(path)
+    candidates = [(size, path) for size, group in by_size.items() if len(group) > 1 for path in group]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        by_partial: Dict[tuple, List[str]] = defaultdict(list)
+        digests = executor.map(lambda c: _partial_hash(c[1], c[0]), candidates)
+        for (size, path), digest in zip(candidates, digests):
+            if digest is not None:
+                by_partial[(size, digest)].append(path)
+
+        groups = []
+        needs_full = []
+        for (size, _), group in by_partial.items():
+            if len(group) < 2:
+                continue
+            if size <= 2 * PARTIAL_BLOCK:
+                groups.append(sorted(group))  # The partial hash already saw every byte
+            else:
+                needs_full.extend((size, path) for path in group)
+
+        by_full: Dict[tuple, List[str]] = defaultdict(list)
+        digests = executor.map(lambda c: _full_hash(c[1]), needs_full)
+        for (size, path), digest in zip(needs_full, digests):
+            if digest is not None:
+                by_full[(size, digest)].append(path)
+        groups.extend(sorted(group) for group in by_full.values() if len(group) > 1)
+
+    return sorted(groups)
+
+def _link_duplicates(groups: List[List[str]]) -> int:
+    """Replaces every copy with a hard link to the first file. Returns bytes freed."""
+    freed = 0
+    for keep, *copies in groups:
+        for copy in copies:
+            try:
+                if os.path.samefile(keep, copy):
+                    continue
+                size = os.stat(copy).st_size
+                temp = copy + ".butler-link"
+                os.link(keep, temp)
+                os.replace(temp, copy)  # Atomic: the name never goes missing
+                freed += size
+            except OSError as e:
+                console.print(f"[red]Could not link {os.path.basename(copy)}: {e}[/red]")
+    return freed
+
+def _print_duplicates(groups: List[List[str]], root: Path) -> None:
+    """Lists each group of identical files, relative to the tidied folder."""
+    table = Table(title=f"Duplicates ({len(groups)} groups)")
+    table.add_column("Kept", style="green")
+    table.add_column("Identical copies", style="yellow")
+    for keep, *copies in groups:
+        table.add_row(os.path.relpath(keep, root), "\n".join(os.path.relpath(c, root) for c in copies))
+    console.print(table)
+
+def execute_plan(path: Path, moves: List[Move], workers: int = 8, progress: bool = True) -> int:
+    """
+    Phase 2: carry out the moves. Returns how many succeeded.
+    Same-device moves are a plain rename (metadata only); anything that
+    has to cross devices is copied by a bounded thread pool.
+    """
+    # Create each folder once, and check which ones live on another device
+    source_device = os.stat(path).st_dev
+    same_device: Dict[str, bool] = {}
+    for category in {move.category for move in moves}:
+        target_dir = path / category
+        target_dir.mkdir(exist_ok=True)
+        same_device[category] = os.stat(target_dir).st_dev == source_device
+
+    moved = 0
+    cross_device = [move for move in moves if not same_device[move.category]]
+
+    renames = [move for move in moves if same_device[move.category]]
+    if progress:
+        renames = track(renames, description="[cyan]🧹 Sweeping up files...", console=console)
+    for move in renames:
+        try:
+            os.rename(move.source, move.target)
+            moved += 1
+        except OSError as e:
+            if e.errno == errno.EXDEV:
+                cross_device.append(move)  # e.g. a folder that is a mount point
+            else:
+                console.print(f"[red]Failed to move {os.path.basename(move.source)}: {e}[/red]")
+
+    if cross_device:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(shutil.move, move.source, move.target): move
+                       for move in cross_device}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    future.result()
+                    moved += 1
+                except Exception as e:
+                    name = os.path.basename(futures[future].source)
+                    console.print(f"[red]Failed to move {name}: {e}[/red]")
+
+    return moved
+
+def _print_plan(moves: List[Move]) -> None:
+    """Shows what a run would do, grouped by folder."""
+    by_category: Dict[str, List[str]] = {}
+    for move in moves:
+        by_category.setdefault(move.category, []).append(os.path.basename(move.source))
+
+    table = Table(title="Tidy Plan (dry run)")
+    table.add_column("Folder", style="cyan")
+    table.add_column("Files", justify="right", style="magenta")
+    table.add_column("Examples", style="white")
+    for category, names in sorted(by_category.items()):
+        examples = ", ".join(names[:3]) + (", ..." if len(names) > 3 else "")
+        table.add_row(category, str(len(names)), examples)
+    console.print(table)
+
+def organize_directory(path_str: str, dry_run: bool = False, workers: int = 8,
+                       recursive: bool = False, dedupe: str = None) -> None:
     """
     Organizes files into subdirectories based on extensions.
     Now with a progress bar!
+    recursive also sweeps up files from subfolders; dedupe ("report" or
+    "link") finds identical files and lists them or hard-links the copies.
     """
     path = Path(path_str)
 
@@ -17,45 +275,93 @@ def organize_directory(path_str: str) -> None:
         console.print(f"[bold red]❌ Error: The path '{path}' does not exist.[/bold red]")
         return
 
-    # 1. Get the list of files first (so we know the total count)
-    # We filter out directories and hidden files like .DS_Store
-    files = [f for f in path.iterdir() if f.is_file() and not f.name.startswith('.')]
+    # 1. Plan first (so we know the total count)
+    moves = plan_directory(path, recursive)
 
-    if not files:
+    if not moves:
         console.print("[yellow]⚠️  This folder is empty. Nothing to do![/yellow]")
         return
 
-    # Define our rules
-    EXTENSIONS = {
-        "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".heic"],
-        "Documents": [".pdf", ".docx", ".txt", ".xlsx", ".pptx", ".md", ".csv"],
-        "Audio": [".mp3", ".wav", ".aac", ".flac"],
-        "Video": [".mp4", ".mov", ".avi", ".mkv"],
-        "Archives": [".zip", ".tar", ".gz", ".rar"],
-        "Code": [".py", ".js", ".html", ".css", ".json", ".cpp"]
-    }
-
-    # 2. The Loop (Wrapped in 'track' for the progress bar)
-    # The 'description' text appears next to the bar
-    for file in track(files, description="[cyan]🧹 Sweeping up files..."):
-
-        file_extension = file.suffix.lower()
-        destination_folder = "Misc"
-
-        # Find the matching category
-        for category, exts in EXTENSIONS.items():
-            if file_extension in exts:
-                destination_folder = category
-                break
-
-        # Create the folder if it doesn't exist
-        target_dir = path / destination_folder
-        target_dir.mkdir(exist_ok=True)
+    duplicates = []
+    if dedupe:
+        with console.status("[bold yellow]Looking for duplicates..."):
+            duplicates = find_duplicates([move.source for move in moves], workers)
 
-        # Move the file
-        try:
-            shutil.move(str(file), str(target_dir / file.name))
-        except Exception as e:
-            console.print(f"[red]Failed to move {file.name}: {e}[/red]")
+    if dry_run:
+        _print_plan(moves)
+        if duplicates:
+            _print_duplicates(duplicates, path)
+        return
+
+    # 2. Execute
+    moved = execute_plan(path, moves, workers)
+
+    console.print(f"[bold green]✨ Done! Organized {moved} files.[/bold green]")
+
+    # 3. Deal with duplicates, which now live at their new paths
+    if duplicates:
+        target_of = {move.source: move.target for move in moves}
+        duplicates = [[target_of[source] for source in group] for group in duplicates]
+        _print_duplicates(duplicates, path)
+        if dedupe == "link":
+            freed = _link_duplicates(duplicates)
+            console.print(f"[bold green]🔗 Hard-linked copies, freed {freed / 1024 ** 2:.1f} MB.[/bold green]")
+
+def _is_partial(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in PARTIAL_SUFFIXES
+
+def watch_directory(path_str: str, settle: float = 2.0, poll: float = 0.5,
+                    backend: str = "auto", stop: threading.Event = None) -> None:
+    """
+    Keeps a folder organised as files land in it (until Ctrl+C or stop is set).
+    A file is moved once its size and mtime have held still for `settle`
+    seconds, so half-written downloads are left alone. Files that become
+    ready together are moved as one batch.
+    """
+    path = Path(path_str)
+    if not path.exists():
+        console.print(f"[bold red]❌ Error: The path '{path}' does not exist.[/bold red]")
+        return
+
+    stop = stop or threading.Event()
+    watch = watcher.open_watcher(path, backend)
+    console.print(f"[bold cyan]👀 Watching {path} ({type(watch).__name__}). Ctrl+C to stop.[/bold cyan]")
+
+    # Start from a tidy folder, then only ever look at what changes
+    existing = [move for move in plan_directory(path) if not _is_partial(move.source)]
+    if existing:
+        execute_plan(path, existing, progress=False)
+
+    # name -> ((size, mtime), when we first saw that size/mtime)
+    pending: Dict[str, tuple] = {}
+    try:
+        while not stop.is_set():
+            # Only wait for events when nothing is settling
+            for name in watch.changes(poll if not pending else min(poll, settle / 4)):
+                if not name.startswith('.') and not _is_partial(name):
+                    pending.setdefault(name, (None, 0.0))
+
+            now = time.monotonic()
+            ready = []
+            for name, (signature, since) in list(pending.items()):
+                try:
+                    st = os.stat(path / name)
+                except FileNotFoundError:
+                    del pending[name]  # Renamed or deleted before it settled
+                    continue
+                if not os.path.isfile(path / name):
+                    del pending[name]
+                elif (st.st_size, st.st_mtime_ns) != signature:
+                    pending[name] = ((st.st_size, st.st_mtime_ns), now)
+                elif now - since >= settle:
+                    ready.append(name)
+                    del pending[name]
 
-    console.print(f"[bold green]✨ Done! Organized {len(files)} files.[/bold green]")
+            if ready:
+                moves = plan_files(path, [str(path / name) for name in sorted(ready)])
+                moved = execute_plan(path, moves, progress=False)
+                console.print(f"[green]🧹 Filed {moved} new file(s): {', '.join(sorted(ready))}[/green]")
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stopped watching.[/yellow]")
+    finally:
+        watch.close()
@@ -0,0 +1,98 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Set
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (then the name)
+
+
+def _names(path: Path) -> Set[str]:
+    """Visible files directly inside path (type comes from the dirent, no stat)."""
+    with os.scandir(path) as entries:
+        return {e.name for e in entries if not e.name.startswith('.') and e.is_file()}
+
+
+class PollingWatcher:
+    """Works everywhere: one directory listing per interval, reports names that appeared."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._seen = _names(path)
+
+    def changes(self, timeout: float) -> Set[str]:
+        time.sleep(timeout)
+        current = _names(self.path)
+        new = current - self._seen
+        self._seen = current
+        return new
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux only: the kernel tells us which names changed, so we never rescan."""
+
+    MASK = IN_CREATE | IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO
+
+    def __init__(self, path: Path):
+        self.path = path
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(str(path)), self.MASK) < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), f"cannot watch {path}")
+
+    def changes(self, timeout: float) -> Set[str]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        names = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            if mask & IN_Q_OVERFLOW:
+                return _names(self.path)  # Kernel queue overflowed: fall back to a listing
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def open_watcher(path: Path, backend: str = "auto"):
+    """Returns an inotify watcher on Linux when possible, else a polling one."""
+    if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except OSError:
+            if backend == "inotify":
+                raise
+    elif backend == "inotify":
+        raise OSError("inotify is only available on Linux")
+    return PollingWatcher(path)
@@ -0,0 +1,118 @@
+import json
+import subprocess
+import sys
+import time
+import pytest
+from butler import brain
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    """Points the memory bank at a throwaway folder."""
+    monkeypatch.setattr(brain, "SNAPSHOT_FILE", tmp_path / "memory.snapshot")
+    monkeypatch.setattr(brain, "LOG_FILE", tmp_path / "memory.log")
+    monkeypatch.setattr(brain, "MEMORY_FILE", tmp_path / "memory.json")
+    monkeypatch.setattr(brain, "LOCK_FILE", tmp_path / "memory.lock")
+    monkeypatch.setattr(brain, "_cache", brain._Cache())
+    return tmp_path
+
+def test_remember_recall_forget(memory, capsys):
+    brain.remember("wifi", "hunter2")
+    brain.remember("editor", "vim")
+    brain.forget("wifi")
+    brain.recall()
+
+    output = capsys.readouterr().out
+    assert "editor: vim" in output
+    assert "wifi: hunter2" not in output
+
+def test_writes_only_append(memory):
+    """Each write adds one line to the log instead of rewriting everything."""
+    for i in range(10):
+        brain.remember(f"key{i}", "x")
+
+    assert len(brain.LOG_FILE.read_bytes().splitlines()) == 10
+    assert not brain.SNAPSHOT_FILE.exists()
+
+def test_torn_record_is_skipped(memory):
+    """A crash mid-append must not lose earlier or later facts."""
+    brain.remember("a", "1")
+    with open(brain.LOG_FILE, "ab") as f:
+        f.write(b'["set", "b", "tor')
+    brain.remember("c", "3")
+
+    assert brain._load_memory() == {"a": "1", "c": "3"}
+
+def test_compaction_folds_log_into_snapshot(memory, monkeypatch):
+    monkeypatch.setattr(brain, "COMPACT_MIN_BYTES", 200)
+    for i in range(20):
+        brain.remember(f"key{i}", "value")
+    brain.forget("key0")
+
+    assert brain.SNAPSHOT_FILE.exists()
+    assert brain.LOG_FILE.stat().st_size < 200
+    data = brain._load_memory()
+    assert len(data) == 19 and "key0" not in data
+
+def test_migrates_legacy_json(memory):
+    brain.MEMORY_FILE.write_text(json.dumps({"old": "fact"}, indent=4))
+
+    brain.remember("new", "fact")
+
+    assert brain._load_memory() == {"old": "fact", "new": "fact"}
+    assert json.loads(brain.SNAPSHOT_FILE.read_text()) == {"old": "fact"}
+
+def test_glob_and_prefix_recall(memory, capsys):
+    for key in ["project.alpha", "project.beta", "projects", "home.wifi"]:
+        brain.remember(key, "x")
+    capsys.readouterr()
+
+    assert set(brain._match("project.*")) == {"project.alpha", "project.beta"}
+    assert set(brain._match("*.wifi")) == {"home.wifi"}
+
+    brain.recall("project.b*")
+    output = capsys.readouterr().out
+    assert "project.beta" in output and "project.alpha" not in output
+
+def test_cache_sees_writes_from_other_processes(memory):
+    brain.remember("mine", "1")
+    assert brain._load_memory() == {"mine": "1"}
+
+    # Another process appends behind our back
+    with open(brain.LOG_FILE, "ab") as f:
+        f.write(b'["set", "theirs", "2"]\n')
+
+    assert brain._load_memory() == {"mine": "1", "theirs": "2"}
+
+WRITER = """
+import sys
+from pathlib import Path
+from butler import brain
+home, worker, count = Path(sys.argv[1]), sys.argv[2], int(sys.argv[3])
+brain.SNAPSHOT_FILE = home / "memory.snapshot"
+brain.LOG_FILE = home / "memory.log"
+brain.LOCK_FILE = home / "memory.lock"
+brain.MEMORY_FILE = home / "memory.json"
+brain.COMPACT_MIN_BYTES = 4096  # Compact often, to race appends against it
+for i in range(count):
+    brain.remember(f"w{worker}.k{i}", str(i))
+"""
+
+def test_concurrent_writers_lose_nothing(memory):
+    """N processes x M writes, with compactions racing the appends."""
+    processes, writes = 4, 100
+    env = {"PYTHONPATH": ":".join(sys.path), "HOME": str(memory)}
+
+    start = time.perf_counter()
+    workers = [
+        subprocess.Popen([sys.executable, "-c", WRITER, str(memory), str(n), str(writes)],
+                         env=env, stdout=subprocess.DEVNULL)
+        for n in range(processes)
+    ]
+    assert all(w.wait(timeout=60) == 0 for w in workers)
+    elapsed = time.perf_counter() - start
+
+    data = brain._load_memory()
+    assert len(data) == processes * writes
+    assert data["w3.k99"] == "99"
+    print(f"\n{processes * writes} locked writes in {elapsed:.2f}s "
+          f"({processes * writes / elapsed:.0f} writes/s, including process startup)")
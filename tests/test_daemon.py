@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+import time
+from butler import daemon
+
+def _start_daemon(home):
+    env = dict(os.environ, HOME=str(home), PYTHONPATH=":".join(sys.path))
+    proc = subprocess.Popen([sys.executable, "-m", "butler.main", "daemon"], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    sock = home / ".butler.sock"
+    for _ in range(100):
+        if daemon.ping(sock):
+            return proc, sock
+        time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("daemon did not start")
+
+def test_forward_runs_command_in_daemon(tmp_path, capsys):
+    """Output and exit codes should make the round trip through the socket."""
+    proc, sock = _start_daemon(tmp_path)
+    try:
+        assert daemon.forward(["remember", "colour", "blue"], sock) == 0
+        assert daemon.forward(["recall", "colour"], sock) == 0
+        assert "colour: blue" in capsys.readouterr().out
+
+        # argparse errors come back on stderr with argparse's exit code
+        assert daemon.forward(["done"], sock) == 2
+        assert "required" in capsys.readouterr().err
+    finally:
+        daemon.stop(sock)
+        proc.wait(timeout=5)
+
+    assert not sock.exists()
+
+def test_forward_without_daemon_returns_none(tmp_path):
+    """The CLI falls back to running in-process when nothing is listening."""
+    assert daemon.forward(["list"], tmp_path / ".butler.sock") is None
@@ -0,0 +1,24 @@
+import subprocess
+import sys
+from butler import main
+
+def test_every_command_has_a_parser_entry():
+    """Each registry key should map back to a real subcommand."""
+    parser = main.build_parser()
+    subparsers = next(a for a in parser._actions if a.dest == "command")
+    for name in main.COMMAND_NAMES:
+        assert name in subparsers.choices
+
+def test_lightweight_commands_skip_heavy_imports(tmp_path):
+    """
+    Dispatching a task command must not pull in Textual, bs4 or requests.
+    We run in a fresh interpreter so other tests can't pollute sys.modules.
+    """
+    code = (
+        "import sys; from butler import main; main.main(['recall']); "
+        "print(sorted(m for m in ('textual', 'bs4', 'requests', 'psutil') if m in sys.modules))"
+    )
+    env = {"HOME": str(tmp_path), "PYTHONPATH": ":".join(sys.path)}
+    output = subprocess.check_output([sys.executable, "-c", code], env=env, text=True)
+
+    assert output.strip().splitlines()[-1] == "[]"
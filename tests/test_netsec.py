@@ -0,0 +1,44 @@
+import asyncio
+import socket
+import pytest
+from butler import netsec
+
+@pytest.fixture
+def listeners():
+    """Stand-in devices: real listening sockets on spare loopback addresses."""
+    socks = []
+    for ip in ("127.0.0.2", "127.0.0.3"):
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.bind((ip, 0))
+        s.listen()
+        socks.append(s)
+    yield [(s.getsockname()[0], s.getsockname()[1]) for s in socks]
+    for s in socks:
+        s.close()
+
+async def _collect(hosts, ports, **kwargs):
+    return [ip async for ip in netsec.discover_hosts(hosts, ports, **kwargs)]
+
+def test_discover_finds_listening_hosts(listeners):
+    ports = [port for _, port in listeners]
+    hosts = [f"127.0.0.{i}" for i in range(2, 10)]
+
+    # On loopback every address answers with a refusal, so only count accepts
+    found = asyncio.run(_collect(hosts, ports, timeout=0.5, concurrency=4, refused_is_up=False))
+
+    assert sorted(found) == ["127.0.0.2", "127.0.0.3"]
+
+def test_refusal_counts_as_up():
+    """A closed port still proves something is there."""
+    assert asyncio.run(netsec.probe_host("127.0.0.4", [1], timeout=0.5))
+
+def test_silent_host_is_down():
+    assert not asyncio.run(netsec.probe_host("127.0.0.4", [1, 2], timeout=0.5, refused_is_up=False))
+
+def test_sweep_streams_hosts(listeners, monkeypatch):
+    ports = [port for _, port in listeners]
+    monkeypatch.setattr(netsec, "icmp_available", lambda: False)
+
+    assert sorted(netsec.sweep("127.0.0.0/29", ports, timeout=0.5)) == [
+        f"127.0.0.{i}" for i in range(1, 7)
+    ]
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+import sqlite3
+import pytest
+from butler import tasks
+
+@pytest.fixture
+def db_file(tmp_path, monkeypatch):
+    """Points the task module at a throwaway database."""
+    path = tmp_path / "butler.db"
+    monkeypatch.setattr(tasks, "DB_FILE", path)
+    return path
+
+def test_add_list_and_complete(db_file, capsys):
+    tasks.add_task("buy milk")
+    tasks.add_task("walk dog", priority=2)
+    tasks.complete_task(1)
+    capsys.readouterr()
+
+    tasks.list_tasks()
+    output = capsys.readouterr().out
+    assert "walk dog" in output
+    assert "buy milk" not in output
+
+    row = tasks._get_connection().execute("SELECT * FROM todos WHERE id = 1").fetchone()
+    assert row["status"] == "done"
+    assert row["completed_at"] is not None
+
+def test_complete_missing_task(db_file, capsys):
+    tasks.complete_task(42)
+    assert "not found" in capsys.readouterr().out
+
+def test_connection_is_reused_and_tuned(db_file):
+    conn = tasks._get_connection()
+    assert tasks._get_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_migrates_legacy_database(db_file):
+    """A database created by the original init_db keeps its rows and gains the new columns."""
+    legacy = sqlite3.connect(db_file)
+    legacy.execute("CREATE TABLE todos (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                   "task TEXT NOT NULL, status TEXT DEFAULT 'pending')")
+    legacy.execute("INSERT INTO todos (task) VALUES ('old task')")
+    legacy.commit()
+    legacy.close()
+
+    conn = tasks._get_connection()
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(todos)")}
+    indexes = {row["name"] for row in conn.execute("PRAGMA index_list(todos)")}
+
+    assert {"created_at", "completed_at", "priority"} <= columns
+    assert "idx_todos_status_id" in indexes
+    assert conn.execute("SELECT task FROM todos").fetchone()["task"] == "old task"
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(tasks.MIGRATIONS)
+
+def test_bulk_import_done_ranges_and_export(db_file, tmp_path, capsys):
+    task_file = tmp_path / "tasks.txt"
+    task_file.write_text("\n".join(f"task {i}" for i in range(1, 51)) + "\n\n")
+
+    tasks.add_tasks_from_file(str(task_file))
+    assert "Imported 50 tasks" in capsys.readouterr().out
+
+    tasks.complete_tasks(["3", "7", "12-40"])
+    assert "Marked 31 tasks" in capsys.readouterr().out
+
+    tasks.export_tasks("jsonl")
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(records) == 50
+    assert sum(r["status"] == "done" for r in records) == 31
+
+    tasks.export_tasks("csv")
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert rows[6]["task"] == "task 7" and rows[6]["status"] == "done"
+
+def test_done_rejects_bad_ids(db_file, capsys):
+    tasks.complete_tasks(["3", "x-y"])
+    assert "must look like" in capsys.readouterr().out
+
+def test_list_pages_with_keyset(db_file, capsys):
+    tasks.import_tasks(f"task {i}" for i in range(1, 11))
+    capsys.readouterr()
+
+    tasks.list_tasks(limit=3, after=4)
+    output = capsys.readouterr().out
+    assert "task 5" in output and "task 7" in output
+    assert "task 4" not in output and "task 8" not in output
+    assert "--after 7" in output
+
+def test_search_ranks_and_tracks_edits(db_file, capsys):
+    tasks.import_tasks(["renew passport", "buy milk", "passport photo for passport renewal"])
+    conn = tasks._get_connection()
+    with conn:
+        conn.execute("UPDATE todos SET task = 'buy oat milk' WHERE id = 2")
+        conn.execute("DELETE FROM todos WHERE id = 1")
+
+    assert [r["id"] for r in conn.execute(tasks.SEARCH_TASKS, (tasks._fts_query("passp"), 10))] == [3]
+    assert [r["id"] for r in conn.execute(tasks.SEARCH_TASKS, (tasks._fts_query("oat"), 10))] == [2]
+
+    # Stray FTS syntax in user input is just text
+    tasks.search_tasks('milk" OR (')
+    assert "No tasks match" in capsys.readouterr().out
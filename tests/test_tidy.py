@@ -1,4 +1,8 @@
 import os
+import sys
+import threading
+import time
+import pytest
 from pathlib import Path
 from butler import tidy
 
@@ -41,3 +45,92 @@ def test_unknown_extension_goes_to_misc(tmp_path):
 
     assert (tmp_path / "Misc").exists()
     assert (tmp_path / "Misc" / "random.data").exists()
+
+def test_dry_run_moves_nothing(tmp_path, capsys):
+    """
+    Test that --dry-run only prints the plan.
+    """
+    (tmp_path / "photo.jpg").touch()
+    (tmp_path / "notes.txt").touch()
+
+    tidy.organize_directory(str(tmp_path), dry_run=True)
+
+    output = capsys.readouterr().out
+    assert "Images" in output and "Documents" in output
+    assert (tmp_path / "photo.jpg").exists()
+    assert not (tmp_path / "Images").exists()
+
+def test_plan_skips_folders_and_hidden_files(tmp_path):
+    (tmp_path / "Images").mkdir()
+    (tmp_path / ".DS_Store").touch()
+    (tmp_path / "Song.MP3").touch()
+
+    moves = tidy.plan_directory(tmp_path)
+
+    assert [(Path(m.source).name, m.category) for m in moves] == [("Song.MP3", "Audio")]
+
+def test_name_clashes_get_numbered(tmp_path):
+    """
+    Test that files never overwrite each other, and the suffixes are predictable.
+    """
+    (tmp_path / "Images").mkdir()
+    (tmp_path / "Images" / "photo.jpg").write_text("already sorted")
+    (tmp_path / "photo.jpg").write_text("new")
+    (tmp_path / "trip").mkdir()
+    (tmp_path / "trip" / "photo.jpg").write_text("from trip")
+
+    tidy.organize_directory(str(tmp_path), recursive=True)
+
+    assert (tmp_path / "Images" / "photo.jpg").read_text() == "already sorted"
+    # Planned in sorted path order: photo.jpg comes before trip/photo.jpg
+    assert (tmp_path / "Images" / "photo (1).jpg").read_text() == "new"
+    assert (tmp_path / "Images" / "photo (2).jpg").read_text() == "from trip"
+
+def test_find_duplicates_narrows_by_size_then_hash(tmp_path):
+    big = os.urandom(300 * 1024)
+    # Same size, same first and last blocks, different middle
+    twin = big[:150 * 1024] + b"X" + big[150 * 1024 + 1:]
+
+    files = {"a.bin": big, "b.bin": big, "c.bin": twin, "d.txt": b"hi", "e.txt": b"hi", "f.txt": b"ho!"}
+    for name, content in files.items():
+        (tmp_path / name).write_bytes(content)
+
+    groups = tidy.find_duplicates(sorted(str(tmp_path / name) for name in files))
+
+    assert [[Path(p).name for p in group] for group in groups] == [["a.bin", "b.bin"], ["d.txt", "e.txt"]]
+
+def test_dedupe_link_hard_links_copies(tmp_path):
+    (tmp_path / "one.pdf").write_bytes(b"same bytes")
+    (tmp_path / "two.pdf").write_bytes(b"same bytes")
+
+    tidy.organize_directory(str(tmp_path), dedupe="link")
+
+    first = tmp_path / "Documents" / "one.pdf"
+    second = tmp_path / "Documents" / "two.pdf"
+    assert os.path.samefile(first, second)
+    assert second.read_bytes() == b"same bytes"
+
+@pytest.mark.parametrize("backend", ["poll", "inotify"])
+def test_watch_files_new_arrivals_once_settled(tmp_path, backend):
+    if backend == "inotify" and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+
+    (tmp_path / "old.txt").touch()
+    stop = threading.Event()
+    thread = threading.Thread(target=tidy.watch_directory, args=(str(tmp_path),),
+                              kwargs={"settle": 0.2, "poll": 0.05, "backend": backend, "stop": stop})
+    thread.start()
+    try:
+        (tmp_path / "new.jpg").write_bytes(b"jpeg")
+        (tmp_path / "movie.mp4.part").write_bytes(b"still downloading")
+
+        deadline = time.monotonic() + 5
+        while not (tmp_path / "Images" / "new.jpg").exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+
+    assert (tmp_path / "Documents" / "old.txt").exists()   # Initial sweep
+    assert (tmp_path / "Images" / "new.jpg").exists()
+    assert (tmp_path / "movie.mp4.part").exists()          # Partial download left alone